@@ -1,7 +1,6 @@
 """
 Export API Routes
 """
-import json
 import os
 from typing import Optional
 from uuid import UUID
@@ -78,11 +77,8 @@ async def create_export(
     service = ExportService()
 
     try:
-        # Convert JSON string to dict
-        work_order_dict = json.loads(work_order)
-        
-        # Convert dict to Pydantic model
-        work_order_obj = ExportWorkOrderCreate(**work_order_dict)
+        # Parse + validate the JSON string in one pass inside pydantic-core
+        work_order_obj = ExportWorkOrderCreate.model_validate_json(work_order)
         
         job = await service.create_export_job(work_order_obj)
         
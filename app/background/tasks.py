@@ -91,27 +91,30 @@ async def process_export_background(export_id: str):
         llm_instructions = work_order.get("user_inputs", {}).get("llm_instructions", True)
         error_msg = []
 
-        # TRANSCRIPT
+        # TRANSCRIPT / EVENTS / INSIGHTS
+        # Each (section, format) pair writes its own file, so generation runs
+        # concurrently in worker threads instead of serially blocking the loop.
+        format_jobs = []
+
         if outputs.get("transcript"):
             is_single_segment = outputs.get("transcript", {}).get("isSingleSegment", False)
             transcript_data = await fabric_client.get_transcript(repo_guid, inputs)
             if transcript_data and transcript_data.get('segments'):
                 for fmt in outputs["transcript"]["formats"]:
-                    filepath, status_msg = _generate_transcript_artifact(generator, transcript_data, fmt, is_single_segment)
-                    if status_msg != "Success":
-                        error_msg.append(status_msg)
-                    artifacts.append(_create_artifact_record(filepath, "transcript", fmt, export_id))
+                    format_jobs.append((
+                        "transcript", fmt,
+                        asyncio.to_thread(_generate_transcript_artifact, generator, transcript_data, fmt, is_single_segment),
+                    ))
 
         # EVENTS
         if outputs.get("events"):
             events_data = await fabric_client.get_events(repo_guid, inputs)
             if events_data and events_data.get('segments'):
                 for fmt in outputs["events"]["formats"]:
-                    filepath, status_msg = _generate_events_artifact(generator, events_data, fmt)
-                    if status_msg != "Success":
-                        error_msg.append(status_msg)
-                    if filepath:
-                        artifacts.append(_create_artifact_record(filepath, "events", fmt, export_id))
+                    format_jobs.append((
+                        "events", fmt,
+                        asyncio.to_thread(_generate_events_artifact, generator, events_data, fmt),
+                    ))
 
         # COMMENTS
         insights_data = None
@@ -119,11 +122,18 @@ async def process_export_background(export_id: str):
             insights_data = await fabric_client.get_insights(repo_guid, inputs)
             if insights_data and insights_data.get('segments'):
                 for fmt in outputs["insights"]["formats"]:
-                    filepath, status_msg = _generate_insights_artifact(generator, insights_data, fmt)
-                    if status_msg != "Success":
-                        error_msg.append(status_msg)
-                    if filepath:
-                        artifacts.append(_create_artifact_record(filepath, "insights", fmt, export_id))
+                    format_jobs.append((
+                        "insights", fmt,
+                        asyncio.to_thread(_generate_insights_artifact, generator, insights_data, fmt),
+                    ))
+
+        if format_jobs:
+            outcomes = await asyncio.gather(*(thread for _, _, thread in format_jobs))
+            for (artifact_type, fmt, _), (filepath, status_msg) in zip(format_jobs, outcomes):
+                if status_msg != "Success":
+                    error_msg.append(status_msg)
+                if filepath:
+                    artifacts.append(_create_artifact_record(filepath, artifact_type, fmt, export_id))
 
         # SELECTS
         # if outputs.get("selects", {}).get("enabled"):
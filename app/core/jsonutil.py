@@ -0,0 +1,24 @@
+"""
+JSON helpers - orjson-backed dumps/loads with a stdlib fallback
+
+The services serialize work orders, manifests and assets on every job
+mutation and re-parse them on every read. orjson handles those nested
+dicts several times faster than stdlib json; the stdlib path keeps the
+app working if orjson is unavailable.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup - stdlib json still works
+    orjson = None
+
+
+if orjson is not None:
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+else:
+    json_dumps = json.dumps
+    json_loads = json.loads
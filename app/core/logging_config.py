@@ -1,3 +1,4 @@
+import functools
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -37,3 +38,24 @@ def setup_logger(name: str = "ai-spark") -> logging.Logger:
 
 # Global logger instance
 logger = setup_logger()
+
+
+def log_errors(message: str, default=None):
+    """Log-and-return-default wrapper for async service methods.
+
+    Replaces the per-method ``try/except Exception`` blocks: the traceback
+    is formatted lazily via ``logger.exception`` only when an exception
+    actually escapes, and the call arguments are appended so the log keeps
+    the job-id context the inline handlers used to interpolate. Pass a
+    callable (e.g. ``list``) when the default must be a fresh object.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                logger.exception(f"{message} : args={args[1:]} kwargs={kwargs}")
+                return default() if callable(default) else default
+        return wrapper
+    return decorator
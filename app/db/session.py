@@ -1,8 +1,10 @@
 """
 SQLite Database Configuration with SQLAlchemy async
 """
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
 
@@ -10,13 +12,35 @@ class Base(DeclarativeBase):
     pass
 
 
-# Create async engine
+# Create async engine with an explicitly sized connection pool so concurrent
+# requests reuse open SQLite connections instead of serializing on the
+# default 5-connection pool.
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,
+    max_overflow=10,
     connect_args={"check_same_thread": False},
 )
 
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each pooled SQLite connection as it is opened.
+
+    WAL lets readers proceed while a writer commits, and
+    synchronous=NORMAL drops the per-commit fsync to a WAL append -
+    together the main write-throughput levers for concurrent job
+    updates against a single database file.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -7,7 +7,7 @@ from enum import Enum
 from uuid import uuid4
 
 from sqlalchemy import (
-    Column, String, Float, Integer, DateTime, Text, Boolean, Enum as SAEnum
+    Column, String, Float, Integer, DateTime, Text, Boolean, Enum as SAEnum, Index
 )
 from sqlalchemy.orm import DeclarativeBase
 
@@ -90,6 +90,12 @@ class ExportJob(Base):
     completed_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Serves "WHERE repo_guid=? ORDER BY created_at DESC LIMIT ?" as a pure
+    # index range scan with no sort step
+    __table_args__ = (
+        Index("ix_export_jobs_repo_created", "repo_guid", created_at.desc()),
+    )
+
     # ------------------------------------------------------------------
     # Helpers for JSON fields
     # ------------------------------------------------------------------
@@ -257,7 +263,14 @@ class VideoSplitJob(Base):
     handle_seconds = Column(Float, default=0.0)
     encoding = Column(String, default="copy")
     work_order = Column(Text, nullable=False)          # JSON
-    status = Column(String, index=True, default=JobStatus.PENDING.value)
+    # Typed enum column: SQLAlchemy converts once at the type boundary, so
+    # callers pass JobStatus members directly and reads come back as members
+    # (still string-comparable since JobStatus subclasses str).
+    status = Column(
+        SAEnum(JobStatus, native_enum=False, values_callable=lambda e: [m.value for m in e]),
+        index=True,
+        default=JobStatus.PENDING,
+    )
     zip_file_path = Column(String, nullable=True)
     requested_by = Column(String, nullable=True)
     results = Column(Text, nullable=True)              # JSON list
@@ -272,6 +285,12 @@ class VideoSplitJob(Base):
     completed_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Serves "WHERE repo_guid=? ORDER BY created_at DESC LIMIT ?" as a pure
+    # index range scan instead of a scan + sort over the repo's history
+    __table_args__ = (
+        Index("ix_video_split_jobs_repo_created", "repo_guid", created_at.desc()),
+    )
+
     def set_work_order(self, value): self.work_order = _to_json(value)
     def get_work_order(self): return _from_json(self.work_order)
     def set_manifest(self, value): self.manifest = _to_json(value)
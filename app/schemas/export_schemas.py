@@ -2,17 +2,27 @@
 Export-related Pydantic Schemas
 """
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional
 from uuid import UUID
 from fastapi.responses import JSONResponse
 
 from pydantic import BaseModel, Field, field_validator
 
+# Fixed value domains — Literal lets pydantic-core validate these with an
+# interned-string pointer compare instead of a generic str validator.
+JobStatusLiteral = Literal["pending", "processing", "completed", "failed", "cancelled"]
+ArtifactFormatLiteral = Literal["json", "csv", "srt", "vtt", "fcpxml", "edl", "txt", "md", "mp4", "zip"]
+ArtifactTypeLiteral = Literal[
+    "transcript", "events", "insights", "selects", "grounding", "llm_instruct",
+    "full_video", "resized_full_video", "seg_video", "resized_seg_video",
+    "merge_video", "resized_merge_video", "custom_seg_video", "resized_custom_seg_video",
+]
+
 
 class OutputFormats(BaseModel):
     """Output format configuration for a specific data type."""
     formats: List[str] = Field(..., min_length=1)
-    isSingleSegment: Optional[bool] = False  
+    isSingleSegment: bool = False
     
     @field_validator("formats")
     @classmethod
@@ -50,7 +60,7 @@ class ExportInputs(BaseModel):
 class UserInputs(BaseModel):
     """User input configuration for export."""
     prompt: Optional[str] = Field(..., min_length=1)
-    llm_instructions: Optional[bool] = True 
+    llm_instructions: bool = True
 
 class ExportOutputs(BaseModel):
     """Export output configuration."""
@@ -82,8 +92,8 @@ class ExportWorkOrderCreate(BaseModel):
 
 class ArtifactResponse(BaseModel):
     """Response schema for an artifact."""
-    artifact_type: str
-    format: str
+    artifact_type: ArtifactTypeLiteral
+    format: ArtifactFormatLiteral
     file_name: str
     file_path: str
     file_size: Optional[int] = None
@@ -96,7 +106,7 @@ class ExportManifest(BaseModel):
     """Export package manifest."""
     export_id: UUID
     repo_guid: str
-    status: str
+    status: JobStatusLiteral
     created_at: datetime
     artifacts: List[ArtifactResponse]
 
@@ -106,7 +116,7 @@ class ExportJobResponse(BaseModel):
     export_id: UUID
     repo_guid: str
     export_job_name: Optional[str] = None
-    status: str
+    status: JobStatusLiteral
     zip_file_path: Optional[str] = None
     export_mode: str
     export_preset: Optional[str]
@@ -123,7 +133,7 @@ class ExportJobResponse(BaseModel):
 class ExportJobStatusResponse(BaseModel):
     """Response schema for export job status."""
     export_id: UUID
-    status: str
+    status: JobStatusLiteral
     created_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -2,11 +2,12 @@
 Import-related Pydantic Schemas
 """
 from datetime import datetime
-from typing import List, Optional, Dict, Any,  Literal
+from typing import List, Optional, Any
 from uuid import UUID
-from fastapi.responses import JSONResponse
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict, model_validator, RootModel
+from pydantic import BaseModel, Field, ConfigDict, ValidationInfo, field_validator
+
+from app.schemas.export_schemas import JobStatusLiteral
 
 
 class ValidationError(BaseModel):
@@ -20,7 +21,7 @@ class ValidationError(BaseModel):
 class Evidence(BaseModel):
     associatedEventIds: Optional[List[str]] = None
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 class Highlight(BaseModel):
     insight: str
@@ -29,35 +30,30 @@ class Highlight(BaseModel):
     confidenceScore: Optional[float] = Field(default=None, ge=0, le=100)
     eventMeta: Evidence
 
-    @model_validator(mode="after")
-    def validate_time_range(self):
-        if self.end < self.start:
+    @field_validator("end")
+    @classmethod
+    def validate_time_range(cls, v: float, info: ValidationInfo) -> float:
+        start = info.data.get("start")
+        if start is not None and v < start:
             raise ValueError("end must be greater than start")
-        return self
+        return v
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 
 class Asset(BaseModel):
     repo_guid: str
     fullPath: str
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 class ImportWorkOrder(BaseModel):
     schemaVersion: str = Field(default="1.0")
     asset: Asset
-    highlights: List[Highlight]
+    highlights: List[Highlight] = Field(..., min_length=1)
     import_job_name: Optional[str] = None
     tag: Optional[str] = None
 
-    @field_validator("highlights")
-    @classmethod
-    def validate_highlights_not_empty(cls, v: List[Highlight]):
-        if not v:
-            raise ValueError("highlights must contain at least one item")
-        return v
-
     model_config = ConfigDict(extra="forbid")
 
 
@@ -66,7 +62,7 @@ class ImportJobResponse(BaseModel):
     import_id: UUID
     import_job_name: Optional[str] = None
     repo_guid: str
-    status: str
+    status: JobStatusLiteral
     tag: Optional[str] = None
     items_processed: int = 0
     items_created: int = 0
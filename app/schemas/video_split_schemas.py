@@ -12,6 +12,8 @@ from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.schemas.export_schemas import ArtifactResponse, JobStatusLiteral
+
 
 # ---------------------------------------------------------------------------
 # Input / work-order schemas
@@ -57,7 +59,7 @@ class VideoSplitWorkOrderCreate(BaseModel):
     video_split_job_name: Optional[str] = Field(None, max_length=255)
     inputs:  ExportVideoInputs  = Field(default_factory=ExportVideoInputs)
     outputs: ExportVideoOutputs = Field(default_factory=ExportVideoOutputs)
-    handle_seconds: float = Field(default=0.0, ge=0, description="Seconds to add before/after each segment")
+    handle_seconds: float = Field(default=0.0, ge=0, le=3600, description="Seconds to add before/after each segment")
     encoding: Optional[str] = Field(default="copy", description="'copy' for fast copy or codec like 'h264'")
     requested_by: Optional[str] = Field(None, max_length=255)
 
@@ -66,21 +68,16 @@ class VideoSplitWorkOrderCreate(BaseModel):
 # Artifact / manifest
 # ---------------------------------------------------------------------------
 
-class ArtifactVideoSplitResponse(BaseModel):
-    artifact_type: str
-    format: str
-    file_name: str
-    file_path: str
-    file_size: Optional[int] = None
-
-    class Config:
-        from_attributes = True
+class ArtifactVideoSplitResponse(ArtifactResponse):
+    """Same shape as the export artifact response — shared so pydantic-core
+    reuses one validator for both artifact schemas."""
+    pass
 
 
 class VideoSplitManifest(BaseModel):
     split_job_id: UUID
     repo_guid:    str
-    status:       str
+    status:       JobStatusLiteral
     created_at:   datetime
     artifacts:    List[ArtifactVideoSplitResponse]
 
@@ -88,7 +85,7 @@ class VideoSplitManifest(BaseModel):
 class ExportVideoSplitManifest(BaseModel):
     split_job_id: UUID
     repo_guid:    str
-    status:       str
+    status:       JobStatusLiteral
     created_at:   datetime
     artifacts:    List[ArtifactVideoSplitResponse]
 
@@ -102,7 +99,7 @@ class VideoSplitJobResponse(BaseModel):
     split_job_id:         UUID
     repo_guid:            str
     video_split_job_name: Optional[str] = None
-    status:               str
+    status:               JobStatusLiteral
     zip_file_path:        Optional[str] = None
     video_file_path:      str
     handle_seconds:       float
@@ -144,9 +141,9 @@ class VideoSplitStatusResponse(BaseModel):
     overall_progress — rolled-up 0-100 across ALL active sections
     sections         — one entry per enabled output type with its own 0-100 progress
     """
-    split_job_id:         str
+    split_job_id:         UUID
     video_split_job_name: Optional[str] = None
-    status:               str
+    status:               JobStatusLiteral
     error_message:        Optional[str] = None
     created_at:           datetime
     started_at:           Optional[datetime] = None
@@ -1,13 +1,15 @@
 """
 Export Service - Business Logic for Export Operations (SQLite)
 """
-import json
+import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 from pathlib import Path
 
-from sqlalchemy import select, desc
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, func, insert, select, update, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import AsyncSessionLocal
@@ -19,221 +21,258 @@ from app.schemas.export_schemas import (
     GetLLmPromptResponse,
     UpdateLLmPromptResponse,
 )
-from app.core.logging_config import logger
+from app.core.jsonutil import json_dumps, json_loads
+from app.core.logging_config import logger, log_errors
 from app.core.config import settings
 
 
+# Statements built once at import - SQLAlchemy reuses the compiled SQL via a
+# stable cache key instead of re-walking a fresh expression tree per call.
+_SELECT_EXPORT_BY_ID = select(ExportJob).where(ExportJob.export_id == bindparam("eid"))
+
+# Built once - reparsing stored manifests through a cached TypeAdapter skips
+# per-call validator construction.
+_MANIFEST_ADAPTER = TypeAdapter(ExportManifest)
+
+# Parsed once - EXPORT_BASE_PATH never changes after startup.
+_EXPORT_BASE = Path(settings.EXPORT_BASE_PATH)
+
+
+@asynccontextmanager
+async def _session_scope(session: Optional[AsyncSession] = None):
+    """Yield the caller's session, or open one and commit it on success.
+
+    Passing one session through several service calls collapses their
+    BEGIN/COMMIT (and the SQLite fsync each implies) into one transaction.
+    """
+    if session is not None:
+        yield session
+    else:
+        async with AsyncSessionLocal() as owned:
+            yield owned
+            await owned.commit()
+_SELECT_EXPORTS_BY_REPO = (
+    select(ExportJob)
+    .where(ExportJob.repo_guid == bindparam("repo"))
+    .order_by(desc(ExportJob.created_at))
+    .limit(bindparam("lim"))
+)
+
+
 class ExportService:
     """Service for managing export operations with SQLite."""
 
     # ------------------------------------------------------------------
     # CREATE EXPORT JOB
     # ------------------------------------------------------------------
+    @log_errors("Failed to create export job")
     async def create_export_job(
         self, work_order: ExportWorkOrderCreate
     ) -> Optional[ExportJobResponse]:
         """Create a new export job."""
-        try:
-            logger.info("-------------------------------  EXPORT JOB -------------------------------")
-            logger.info(
-                f"Creating export job : repo_guid={work_order.repo_guid} , "
-                f"export_mode={work_order.metadata.export_mode}"
-            )
-
-            valid = await self._validate_edl_usage(work_order)
-            if not valid:
-                logger.error("EDL validation failed")
-                return None
-
-            async with AsyncSessionLocal() as session:
-                job = ExportJob(
-                    export_id=str(uuid4()),
-                    repo_guid=work_order.repo_guid,
-                    export_job_name=work_order.export_job_name,
-                    export_mode=work_order.metadata.export_mode,
-                    export_preset=work_order.metadata.export_preset,
-                    work_order=json.dumps(work_order.model_dump(mode="json")),
-                    requested_by=work_order.metadata.requested_by,
-                    status=JobStatus.PENDING.value,
-                )
-                session.add(job)
-                await session.commit()
-                await session.refresh(job)
+        logger.info("-------------------------------  EXPORT JOB -------------------------------")
+        logger.info(
+            f"Creating export job : repo_guid={work_order.repo_guid} , "
+            f"export_mode={work_order.metadata.export_mode}"
+        )
+
+        valid = await self._validate_edl_usage(work_order)
+        if not valid:
+            logger.error("EDL validation failed")
+            return None
 
-            logger.info(f"Export job created : export_id={job.export_id} , status={job.status}")
-            return self._to_response(job)
+        async with AsyncSessionLocal() as session:
+            job = ExportJob(
+                export_id=str(uuid4()),
+                repo_guid=work_order.repo_guid,
+                export_job_name=work_order.export_job_name,
+                export_mode=work_order.metadata.export_mode,
+                export_preset=work_order.metadata.export_preset,
+                work_order=work_order.model_dump_json(),
+                requested_by=work_order.metadata.requested_by,
+                status=JobStatus.PENDING.value,
+            )
+            session.add(job)
+            # No refresh needed: expire_on_commit=False and every column
+            # default is Python-side, so the object is already populated.
+            await session.commit()
 
-        except Exception as exc:
-            logger.error(f"Failed to create export job : error={exc}", exc_info=True)
-            return None
+        logger.info(f"Export job created : export_id={job.export_id} , status={job.status}")
+        return self._to_response(job)
 
     # ------------------------------------------------------------------
     # VALIDATE EDL USAGE
     # ------------------------------------------------------------------
+    @log_errors("EDL validation crashed", default=False)
     async def _validate_edl_usage(self, work_order: ExportWorkOrderCreate) -> bool:
-        try:
-            outputs = work_order.outputs
-            if outputs.transcript and "edl" in outputs.transcript.formats:
-                logger.error("EDL format not allowed for transcript")
-                return False
-            return True
-        except Exception as exc:
-            logger.error(f"EDL validation crashed : error={exc}", exc_info=True)
+        outputs = work_order.outputs
+        if outputs.transcript and "edl" in outputs.transcript.formats:
+            logger.error("EDL format not allowed for transcript")
             return False
+        return True
 
     # ------------------------------------------------------------------
     # GET SINGLE EXPORT JOB
     # ------------------------------------------------------------------
+    @log_errors("Failed to fetch export job")
     async def get_export_job(self, export_id: UUID) -> Optional[ExportJobResponse]:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ExportJob).where(ExportJob.export_id == str(export_id))
-                )
-                job = result.scalar_one_or_none()
-                if not job:
-                    return None
-
-                manifest = None
-                if job.status == JobStatus.COMPLETED.value and job.manifest:
-                    manifest = ExportManifest(**json.loads(job.manifest))
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                _SELECT_EXPORT_BY_ID, {"eid": str(export_id)}
+            )
+            job = result.scalar_one_or_none()
+            if not job:
+                return None
 
-                response = self._to_response(job)
-                response.manifest = manifest
-                
-                return response
+            manifest = None
+            if job.status == JobStatus.COMPLETED.value and job.manifest:
+                manifest = ExportManifest(**json_loads(job.manifest))
 
-        except Exception as exc:
-            logger.error(f"Failed to fetch export job : export_id={export_id} , error={exc}", exc_info=True)
-            return None
+            response = self._to_response(job)
+            response.manifest = manifest
+            
+            return response
 
     # ------------------------------------------------------------------
     # LIST EXPORT JOBS
     # ------------------------------------------------------------------
+    @log_errors("Failed to list export jobs", default=list)
     async def get_export_jobs_by_repo(
         self, repo_guid: str, limit: int = 100
     ) -> List[ExportJobResponse]:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ExportJob)
-                    .where(ExportJob.repo_guid == repo_guid)
-                    .order_by(desc(ExportJob.created_at))
-                    .limit(limit)
-                )
-                jobs = result.scalars().all()
-                return [self._to_response(job) for job in jobs]
+        async with AsyncSessionLocal() as session:
+            # Stream rows instead of materializing the full ORM list, so
+            # only the response objects are held; rows convert as they
+            # arrive from the driver.
+            stream = await session.stream(
+                _SELECT_EXPORTS_BY_REPO,
+                {"repo": repo_guid, "lim": limit},
+                execution_options={"yield_per": 50},
+            )
+            return [self._to_response(job) async for job in stream.scalars()]
 
-        except Exception as exc:
-            logger.error(f"Failed to list export jobs : repo_guid={repo_guid} , error={exc}", exc_info=True)
-            return []
+    # ------------------------------------------------------------------
+    # SHARED SESSION SCOPE
+    # ------------------------------------------------------------------
+    @staticmethod
+    def session_scope():
+        """Context manager giving one session/transaction for a whole
+        update -> manifest -> artifacts sequence."""
+        return _session_scope()
 
     # ------------------------------------------------------------------
     # UPDATE JOB STATUS
     # ------------------------------------------------------------------
+    @log_errors("Failed to update job status", default=False)
     async def update_job_status(
         self,
         export_id: UUID,
         status: JobStatus,
         error_message: Optional[str] = None,
         error_details: Optional[dict] = None,
+        session: Optional[AsyncSession] = None,
     ) -> bool:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ExportJob).where(ExportJob.export_id == str(export_id))
-                )
-                job = result.scalar_one_or_none()
-                if not job:
-                    logger.error(f"Export job not found : export_id={export_id}")
-                    return False
-
-                job.status = status.value
-                job.error_message = error_message  # store as plain string
-                job.error_details = json.dumps(error_details) if error_details else None
-                job.updated_at = datetime.utcnow()
-
-                if status == JobStatus.PROCESSING and not job.started_at:
-                    job.started_at = datetime.utcnow()
-                elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-                    job.completed_at = datetime.utcnow()
-
-                await session.commit()
-
-            logger.info(f"Export job status updated : export_id={export_id} , status={status}")
-            return True
+        now = datetime.utcnow()
+        values = {
+            "status": status.value,
+            "error_message": error_message,  # store as plain string
+            "error_details": json_dumps(error_details) if error_details else None,
+            "updated_at": now,
+        }
+        if status == JobStatus.PROCESSING:
+            # keep the original started_at if the job was already processing
+            values["started_at"] = func.coalesce(ExportJob.started_at, now)
+        elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+            values["completed_at"] = now
+
+        # Single-row UPDATE - no SELECT round-trip, no ORM materialization
+        async with _session_scope(session) as db:
+            result = await db.execute(
+                update(ExportJob)
+                .where(ExportJob.export_id == str(export_id))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
 
-        except Exception as exc:
-            logger.error(f"Failed to update job status : export_id={export_id} , error={exc}", exc_info=True)
+        if result.rowcount == 0:
+            logger.error(f"Export job not found : export_id={export_id}")
             return False
 
+        logger.info(f"Export job status updated : export_id={export_id} , status={status}")
+        return True
+
     # ------------------------------------------------------------------
     # SAVE MANIFEST
     # ------------------------------------------------------------------
-    async def save_manifest(self, export_id: UUID, manifest: ExportManifest) -> bool:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ExportJob).where(ExportJob.export_id == str(export_id))
+    @log_errors("Failed to save export manifest", default=False)
+    async def save_manifest(
+        self, export_id: UUID, manifest: ExportManifest,
+        session: Optional[AsyncSession] = None,
+    ) -> bool:
+        async with _session_scope(session) as db:
+            result = await db.execute(
+                update(ExportJob)
+                .where(ExportJob.export_id == str(export_id))
+                .values(
+                    manifest=manifest.model_dump_json(),
+                    updated_at=datetime.utcnow(),
                 )
-                job = result.scalar_one_or_none()
-                if not job:
-                    logger.error(f"Export job not found for manifest : export_id={export_id}")
-                    return False
-
-                job.manifest = json.dumps(manifest.model_dump(mode="json"))
-                job.updated_at = datetime.utcnow()
-                await session.commit()
-
-            logger.info(f"Export manifest saved : export_id={export_id}")
-            return True
+                .execution_options(synchronize_session=False)
+            )
 
-        except Exception as exc:
-            logger.error(f"Failed to save export manifest : export_id={export_id} , error={exc}", exc_info=True)
+        if result.rowcount == 0:
+            logger.error(f"Export job not found for manifest : export_id={export_id}")
             return False
 
+        logger.info(f"Export manifest saved : export_id={export_id}")
+        return True
+
     # ------------------------------------------------------------------
     # SAVE ARTIFACTS
     # ------------------------------------------------------------------
-    async def save_artifacts(self, export_job_id: UUID, artifacts: List[dict]) -> bool:
-        try:
-            if not artifacts:
-                return True
-
-            async with AsyncSessionLocal() as session:
-                for artifact_data in artifacts:
-                    artifact = Artifact(
-                        export_job_id=str(export_job_id),
-                        artifact_type=artifact_data.get("artifact_type", ""),
-                        format=artifact_data.get("format", ""),
-                        filename=artifact_data.get("filename", ""),
-                        file_path=artifact_data.get("file_path", artifact_data.get("filename", "")),
-                        url=artifact_data.get("url", ""),
-                        file_size=artifact_data.get("file_size"),
-                        checksum=artifact_data.get("checksum"),
-                    )
-                    session.add(artifact)
-                await session.commit()
-
-            logger.info(f"Artifacts saved : export_job_id={export_job_id} , count={len(artifacts)}")
+    @log_errors("Failed to save artifacts", default=False)
+    async def save_artifacts(
+        self, export_job_id: UUID, artifacts: List[dict],
+        session: Optional[AsyncSession] = None,
+    ) -> bool:
+        if not artifacts:
             return True
 
-        except Exception as exc:
-            logger.error(f"Failed to save artifacts : export_job_id={export_job_id} , error={exc}", exc_info=True)
-            return False
-        
+        # Single executemany insert - one round-trip instead of N ORM adds
+        rows = [
+            {
+                "export_job_id": str(export_job_id),
+                "artifact_type": artifact_data.get("artifact_type", ""),
+                "format": artifact_data.get("format", ""),
+                "filename": artifact_data.get("filename", ""),
+                "file_path": artifact_data.get("file_path", artifact_data.get("filename", "")),
+                "url": artifact_data.get("url", ""),
+                "file_size": artifact_data.get("file_size"),
+                "checksum": artifact_data.get("checksum"),
+            }
+            for artifact_data in artifacts
+        ]
+
+        async with _session_scope(session) as db:
+            await db.execute(insert(Artifact), rows)
+
+        logger.info(f"Artifacts saved : export_job_id={export_job_id} , count={len(artifacts)}")
+        return True
+
     # ------------------------------------------------------------------
     # LLM PROMPT (file-based, unchanged)
     # ------------------------------------------------------------------
     async def update_llm_prompt(self, export_job_id: UUID, prompt: str) -> UpdateLLmPromptResponse:
-        output_folder_path: Path = Path(settings.EXPORT_BASE_PATH)
-        job_folder = output_folder_path / str(export_job_id)
+        job_folder = _EXPORT_BASE / str(export_job_id)
         llm_prompt_file_path = job_folder / "sdna_ai_spark_llm_instructions.md"
 
         try:
             job_folder.mkdir(parents=True, exist_ok=True)
-            with open(llm_prompt_file_path, "w", encoding="utf-8") as f:
-                f.write(prompt)
+            # Write to a sibling temp file then rename - readers never see a
+            # half-written prompt and a crash cannot truncate the live file.
+            tmp_path = llm_prompt_file_path.with_suffix(".md.tmp")
+            tmp_path.write_text(prompt, encoding="utf-8")
+            os.replace(tmp_path, llm_prompt_file_path)
 
             return UpdateLLmPromptResponse(
                 export_id=export_job_id,
@@ -252,15 +291,15 @@ class ExportService:
             )
 
     async def get_llm_prompt(self, export_job_id: UUID) -> GetLLmPromptResponse:
-        output_folder_path: Path = Path(settings.EXPORT_BASE_PATH)
-        job_folder = output_folder_path / str(export_job_id)
+        job_folder = _EXPORT_BASE / str(export_job_id)
         llm_prompt_file_path = job_folder / "sdna_ai_spark_llm_instructions.md"
 
         try:
-            job_folder.mkdir(parents=True, exist_ok=True)
+            # Only touch the filesystem beyond one stat when the prompt file
+            # is genuinely missing - this is the hot read path.
             if not llm_prompt_file_path.exists():
-                with open(llm_prompt_file_path, "w", encoding="utf-8") as f:
-                    f.write("")
+                job_folder.mkdir(parents=True, exist_ok=True)
+                llm_prompt_file_path.write_text("", encoding="utf-8")
 
             return GetLLmPromptResponse(
                 export_id=export_job_id,
@@ -283,38 +322,41 @@ class ExportService:
     # ------------------------------------------------------------------
     @staticmethod
     def _to_response(job: ExportJob) -> ExportJobResponse:
-        return ExportJobResponse.model_validate({
-            "export_id": job.export_id,
-            "repo_guid": job.repo_guid,
-            "export_job_name": job.export_job_name,
-            "export_mode": job.export_mode,
-            "export_preset": job.export_preset,
-            "work_order": json.loads(job.work_order) if job.work_order else {},
-            "status": job.status,
-            "zip_file_path": job.zip_file_path,
-            "requested_by": job.requested_by,
-            "export_path": job.export_path,
-            "manifest": json.loads(job.manifest) if job.manifest else None,
-            "error_message": ExportService._parse_error_message(job.error_message),
-            "error_details": json.loads(job.error_details) if job.error_details else None,
-            "created_at": job.created_at,
-            "started_at": job.started_at,
-            "completed_at": job.completed_at,
-            "updated_at": job.updated_at,
-        })
+        # Rows from our own DB are trusted, so model_construct skips the full
+        # validation pass. export_id is coerced explicitly and the manifest -
+        # the one JSON-sourced blob that really needs coercion - goes through
+        # a cached TypeAdapter.
+        return ExportJobResponse.model_construct(
+            export_id=UUID(job.export_id),
+            repo_guid=job.repo_guid,
+            export_job_name=job.export_job_name,
+            export_mode=job.export_mode,
+            export_preset=job.export_preset,
+            status=job.status,
+            zip_file_path=job.zip_file_path,
+            manifest=_MANIFEST_ADAPTER.validate_python(json_loads(job.manifest)) if job.manifest else None,
+            error_message=ExportService._parse_error_message(job.error_message),
+            created_at=job.created_at,
+            started_at=job.started_at,
+            completed_at=job.completed_at,
+        )
 
     @staticmethod
     def _parse_error_message(raw: str | None) -> str | None:
         """Convert stored error_message (may be JSON list or plain string) to Optional[str]."""
         if not raw:
             return None
+        # Cheap prefix check - most stored messages are plain strings, so
+        # skip the JSON parser unless the value can actually be JSON
+        if raw[0] not in '[{"':
+            return raw
         try:
-            parsed = json.loads(raw)
+            parsed = json_loads(raw)
             if isinstance(parsed, list):
                 joined = " | ".join(str(e) for e in parsed if e)
                 return joined if joined else None
             if isinstance(parsed, str):
                 return parsed or None
             return str(parsed)
-        except (json.JSONDecodeError, TypeError):
+        except (ValueError, TypeError):  # covers both stdlib and orjson decode errors
             return raw or None
\ No newline at end of file
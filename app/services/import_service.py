@@ -1,12 +1,12 @@
 """
 Import Service - Business Logic for Import Operations (SQLite)
 """
-import json
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID, uuid4
 
-from sqlalchemy import select, desc
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, func, insert, select, update, desc
 
 from app.db.session import AsyncSessionLocal
 from app.models.models import ImportHighlight, ImportLLmJob, JobStatus
@@ -16,7 +16,16 @@ from app.schemas.import_schemas import (
     ImportWorkOrder,
     Highlight,
 )
-from app.core.logging_config import logger
+from app.core.jsonutil import json_dumps, json_loads
+from app.core.logging_config import logger, log_errors
+
+# Built once at import - validates/coerces a whole highlight list in a single
+# pydantic-core pass instead of constructing models one by one.
+_HIGHLIGHTS_ADAPTER = TypeAdapter(List[Highlight])
+_VALIDATION_ERRORS_ADAPTER = TypeAdapter(List[ValidationError])
+
+# Built once at import so the compiled SQL is reused across calls
+_SELECT_IMPORT_BY_ID = select(ImportLLmJob).where(ImportLLmJob.import_id == bindparam("iid"))
 
 
 class ImportService:
@@ -25,98 +34,112 @@ class ImportService:
     # ------------------------------------------------------------------
     # CREATE IMPORT JOB
     # ------------------------------------------------------------------
+    @log_errors("Failed to create LLM import job")
     async def create_import_job(
         self, work_order: ImportWorkOrder,
     ) -> Optional[ImportJobResponse]:
         """Create a new Custom Timeline Event import job."""
-        try:
-            logger.info("---------------- LLM IMPORT JOB ----------------")
-            
-            validation_errors = self._validate_highlights(work_order.highlights)
-
-            async with AsyncSessionLocal() as session:
-                import_id = str(uuid4())
-                asset_json = json.dumps(work_order.asset.model_dump(mode="json"))
-
-                if validation_errors:
-                    job = ImportLLmJob(
-                        import_id=import_id,
-                        asset=asset_json,
-                        status=JobStatus.FAILED.value,
-                        import_job_name=work_order.import_job_name,
-                        tag=work_order.tag,
-                        validation_errors=json.dumps([e.model_dump() for e in validation_errors]),
-                        error_message="Validation failed",
-                    )
-                else:
-                    job = ImportLLmJob(
-                        import_id=import_id,
-                        asset=asset_json,
-                        status=JobStatus.PENDING.value,
-                        tag=work_order.tag,
-                        import_job_name=work_order.import_job_name,
-                    )
-
-                session.add(job)
-                await session.flush()  # get PK before adding highlights
-
-                # # Insert highlights
-                # for h in work_order.highlights:
-                #     h_obj = h if isinstance(h, Highlight) else Highlight(**h)
-                #     highlight = ImportHighlight(
-                #         import_id=import_id,
-                #         insight=h_obj.insight,
-                #         start=h_obj.start,
-                #         end=h_obj.end,
-                #         confidence_score=h_obj.confidenceScore if h_obj.confidenceScore is not None else 0,
-                #         event_meta=json.dumps(h_obj.eventMeta.model_dump() if h_obj.eventMeta else None),
-                #     )
-                #     session.add(highlight)
-
-                await session.commit()
-                await session.refresh(job)
-
-            logger.info(
-                f"LLM import job created : import_id={job.import_id} , "
-                f"status={job.status} , validation_errors={len(validation_errors)}"
-            )
+        logger.info("---------------- LLM IMPORT JOB ----------------")
+        
+        validation_errors, highlights = self._validate_highlights(work_order.highlights)
+
+        async with AsyncSessionLocal() as session:
+            import_id = str(uuid4())
+            asset_json = work_order.asset.model_dump_json()
+
+            if validation_errors:
+                job = ImportLLmJob(
+                    import_id=import_id,
+                    asset=asset_json,
+                    status=JobStatus.FAILED.value,
+                    import_job_name=work_order.import_job_name,
+                    tag=work_order.tag,
+                    validation_errors=_VALIDATION_ERRORS_ADAPTER.dump_json(validation_errors).decode(),
+                    error_message="Validation failed",
+                )
+            else:
+                job = ImportLLmJob(
+                    import_id=import_id,
+                    asset=asset_json,
+                    status=JobStatus.PENDING.value,
+                    tag=work_order.tag,
+                    import_job_name=work_order.import_job_name,
+                )
 
-            asset = json.loads(job.asset)
-            return ImportJobResponse(
-                import_id=job.import_id,
-                import_job_name=job.import_job_name,
-                repo_guid=asset.get("repo_guid"),
-                status=job.status,
-                tag=job.tag,
-                items_processed=job.items_processed,
-                items_created=job.items_created,
-                items_updated=job.items_updated,
-                items_skipped=job.items_skipped,
-                validation_errors=json.loads(job.validation_errors) if job.validation_errors else None,
-                error_message=job.error_message,
-                created_at=job.created_at,
-                started_at=job.started_at,
-                completed_at=job.completed_at,
-            )
+            session.add(job)
+            await session.flush()  # get PK before adding highlights
+
+            # Insert highlights in one executemany statement - the work
+            # order already validated them into Highlight models
+            if not validation_errors:
+                rows = [
+                    {
+                        "import_id": import_id,
+                        "insight": h.insight,
+                        "start": h.start,
+                        "end": h.end,
+                        "confidence_score": h.confidenceScore if h.confidenceScore is not None else 0,
+                        "event_meta": json_dumps(h.eventMeta.model_dump() if h.eventMeta else None),
+                    }
+                    for h in highlights
+                ]
+                if rows:
+                    await session.execute(insert(ImportHighlight), rows)
+
+            # No refresh needed: expire_on_commit=False and every column
+            # default is Python-side, so the object is already populated.
+            await session.commit()
+
+        logger.info(
+            f"LLM import job created : import_id={job.import_id} , "
+            f"status={job.status} , validation_errors={len(validation_errors)}"
+        )
+
+        return self._to_response(job)
 
-        except Exception as e:
-            logger.exception(f"Failed to create LLM import job : error={e}")
-            return None
+    # ------------------------------------------------------------------
+    # HELPER
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _to_response(job: ImportLLmJob) -> ImportJobResponse:
+        # Rows from our own DB are trusted - model_construct skips the full
+        # validation pass; validation_errors reuse the cached TypeAdapter.
+        asset = json_loads(job.asset) if job.asset else {}
+        return ImportJobResponse.model_construct(
+            import_id=UUID(job.import_id),
+            import_job_name=job.import_job_name,
+            repo_guid=asset.get("repo_guid"),
+            status=job.status,
+            tag=job.tag,
+            items_processed=job.items_processed,
+            items_created=job.items_created,
+            items_updated=job.items_updated,
+            items_skipped=job.items_skipped,
+            validation_errors=(
+                _VALIDATION_ERRORS_ADAPTER.validate_python(json_loads(job.validation_errors))
+                if job.validation_errors else None
+            ),
+            error_message=job.error_message,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            completed_at=job.completed_at,
+        )
 
     # ------------------------------------------------------------------
     # VALIDATION
     # ------------------------------------------------------------------
-    def _validate_highlights(self, highlights: List[Highlight]) -> List[ValidationError]:
+    def _validate_highlights(
+        self, highlights: List[Highlight]
+    ) -> tuple[List[ValidationError], List[Highlight]]:
+        """Validate and normalize highlights in one pass.
+
+        Returns (errors, normalized_highlights) so callers reuse the coerced
+        models instead of re-running the coercion themselves.
+        """
         errors: List[ValidationError] = []
+        clean_highlights: List[Highlight] = []
         try:
-            
-            clean_highlights = []
-
-            for h in highlights:
-                if isinstance(h, dict):
-                    clean_highlights.append(Highlight(**h))
-                elif isinstance(h, Highlight):
-                    clean_highlights.append(h)
+            clean_highlights = _HIGHLIGHTS_ADAPTER.validate_python(highlights)
 
             for i, h in enumerate(clean_highlights):
                 if h.start < 0:
@@ -144,46 +167,27 @@ class ImportService:
                 message="Unexpected validation failure",
                 value=str(e),
             ))
-        return errors
+        return errors, clean_highlights
 
     # ------------------------------------------------------------------
     # GET JOB
     # ------------------------------------------------------------------
+    @log_errors("Failed to fetch LLM import job")
     async def get_import_job(self, import_id: UUID) -> Optional[ImportJobResponse]:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ImportLLmJob).where(ImportLLmJob.import_id == str(import_id))
-                )
-                job = result.scalar_one_or_none()
-                if not job:
-                    return None
-
-                asset = json.loads(job.asset)
-                return ImportJobResponse(
-                    import_id=job.import_id,
-                    import_job_name=job.import_job_name,
-                    repo_guid=asset.get("repo_guid"),
-                    status=job.status,
-                    tag=job.tag,
-                    items_processed=job.items_processed,
-                    items_created=job.items_created,
-                    items_updated=job.items_updated,
-                    items_skipped=job.items_skipped,
-                    validation_errors=json.loads(job.validation_errors) if job.validation_errors else None,
-                    error_message=job.error_message,
-                    created_at=job.created_at,
-                    started_at=job.started_at,
-                    completed_at=job.completed_at,
-                )
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                _SELECT_IMPORT_BY_ID, {"iid": str(import_id)}
+            )
+            job = result.scalar_one_or_none()
+            if not job:
+                return None
 
-        except Exception as e:
-            logger.exception(f"Failed to fetch LLM import job : id={import_id} , error={e}")
-            return None
+            return self._to_response(job)
 
     # ------------------------------------------------------------------
     # UPDATE STATUS
     # ------------------------------------------------------------------
+    @log_errors("Failed to update LLM import job")
     async def update_job_status(
         self,
         import_id: UUID,
@@ -195,75 +199,56 @@ class ImportService:
         error_message: Optional[str] = None,
         error_details: Optional[dict] = None,
     ) -> None:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ImportLLmJob).where(ImportLLmJob.import_id == str(import_id))
-                )
-                job = result.scalar_one_or_none()
-                if not job:
-                    logger.warning(f"LLM import job not found : id={import_id}")
-                    return
-
-                job.status = status.value
-                job.items_processed = items_processed
-                job.items_created = items_created
-                job.items_updated = items_updated
-                job.items_skipped = items_skipped
-                job.error_message = error_message
-                job.error_details = json.dumps(error_details) if error_details else None
-                job.updated_at = datetime.utcnow()
-
-                if status == JobStatus.PROCESSING and not job.started_at:
-                    job.started_at = datetime.utcnow()
-                elif status in (JobStatus.COMPLETED, JobStatus.FAILED):
-                    job.completed_at = datetime.utcnow()
-
-                await session.commit()
+        now = datetime.utcnow()
+        values = {
+            "status": status.value,
+            "items_processed": items_processed,
+            "items_created": items_created,
+            "items_updated": items_updated,
+            "items_skipped": items_skipped,
+            "error_message": error_message,
+            "error_details": json_dumps(error_details) if error_details else None,
+            "updated_at": now,
+        }
+        if status == JobStatus.PROCESSING:
+            # keep the original started_at if the job was already processing
+            values["started_at"] = func.coalesce(ImportLLmJob.started_at, now)
+        elif status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            values["completed_at"] = now
+
+        # Single-row UPDATE - no SELECT round-trip, no ORM materialization
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                update(ImportLLmJob)
+                .where(ImportLLmJob.import_id == str(import_id))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
 
-            logger.info(f"LLM import job updated : id={import_id} , status={status}")
+        if result.rowcount == 0:
+            logger.warning(f"LLM import job not found : id={import_id}")
+            return
 
-        except Exception as e:
-            logger.exception(f"Failed to update LLM import job : id={import_id} , error={e}")
+        logger.info(f"LLM import job updated : id={import_id} , status={status}")
 
     # ------------------------------------------------------------------
     # LIST IMPORT JOBS
     # ------------------------------------------------------------------
+    @log_errors("Failed to list import jobs", default=list)
     async def get_import_jobs_by_repo(
         self, repo_guid: str, limit: int = 100
     ) -> List[ImportJobResponse]:
-        try:
-            async with AsyncSessionLocal() as session:
-                result = await session.execute(
-                    select(ImportLLmJob)
-                    .order_by(desc(ImportLLmJob.created_at))
-                    .limit(limit)
-                )
-                jobs = result.scalars().all()
-
-                out = []
-                for job in jobs:
-                    asset = json.loads(job.asset) if job.asset else {}
-                    if asset.get("repo_guid") != repo_guid:
-                        continue
-                    out.append(ImportJobResponse(
-                        import_id=job.import_id,
-                        import_job_name=job.import_job_name,
-                        repo_guid=asset.get("repo_guid"),
-                        status=job.status,
-                        tag=job.tag,
-                        items_processed=job.items_processed,
-                        items_created=job.items_created,
-                        items_updated=job.items_updated,
-                        items_skipped=job.items_skipped,
-                        validation_errors=json.loads(job.validation_errors) if job.validation_errors else None,
-                        error_message=job.error_message,
-                        created_at=job.created_at,
-                        started_at=job.started_at,
-                        completed_at=job.completed_at,
-                    ))
-                return out
+        async with AsyncSessionLocal() as session:
+            # Filter inside SQLite via json_extract so only matching rows
+            # reach Python and the limit counts real matches; stream the
+            # rows so only the response list is materialized
+            stream = await session.stream(
+                select(ImportLLmJob)
+                .where(func.json_extract(ImportLLmJob.asset, "$.repo_guid") == repo_guid)
+                .order_by(desc(ImportLLmJob.created_at))
+                .limit(limit),
+                execution_options={"yield_per": 50},
+            )
+            return [self._to_response(job) async for job in stream.scalars()]
 
-        except Exception as exc:
-            logger.error(f"Failed to list import jobs : repo_guid={repo_guid} , error={exc}", exc_info=True)
-            return []
@@ -71,7 +71,9 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Small job/status payloads are mostly UUIDs and paths that compress poorly;
+# 4 KiB keeps gzip for large manifests without burning CPU on every response.
+app.add_middleware(GZipMiddleware, minimum_size=4096)
 
 
 # -------------------- Global exception handler --------------------